@@ -22,6 +22,9 @@ from config.paths import ITEMS_MAP, MASTER_JSON
 from core.params_io import load_master_params
 from core.data_manager import DataManager
 from core.env_1113_revised_with_datamanager import GenerativeInvEnv, WeeklyInvEnv, CostParams
+from inventory_heuristics import (
+    search_heuristics, rerank_candidates, SSPolicy, rollout_heuristic, collect_bc_data, behavior_clone
+)
 
 from stable_baselines3 import A2C
 from stable_baselines3.common.callbacks import BaseCallback, CheckpointCallback
@@ -245,6 +248,9 @@ class BestModelCallback(BaseCallback):
 # 평가 함수
 # ========================================
 
+# 다중 시드 Test 평가 시드 (A2C / 휴리스틱 baseline 공통)
+TEST_SEEDS = [42, 123, 456, 789, 1000, 1111, 2222, 3333, 4444, 5555]
+
 def evaluate_policy(env, model, episodes=1, seed=123, deterministic=True):
     """모델 평가 및 trajectory 반환"""
     traj = []
@@ -292,7 +298,7 @@ def multi_seed_evaluation(dm, args, cost, final_model, output_dir, n_seeds=10):
     """다중 시드로 Test 평가 수행"""
     print("\n=== 다중 시드 Test 평가 (10 seeds) ===")
 
-    test_seeds = [42, 123, 456, 789, 1000, 1111, 2222, 3333, 4444, 5555]
+    test_seeds = TEST_SEEDS
     test_rewards = []
 
     for i, seed in enumerate(test_seeds):
@@ -347,6 +353,138 @@ def multi_seed_evaluation(dm, args, cost, final_model, output_dir, n_seeds=10):
     return test_mean, test_std, test_ci95, test_rewards
 
 
+def run_heuristic_baseline(dm, args, cost, buf, model, output_dir):
+    """
+    (s,S) 휴리스틱 탐색 + baseline 평가 (+ 선택적 BC warm start)
+
+    학습/검증 환경(train_env, valid_env)의 RNG 흐름을 건드리지 않도록 전용 환경 인스턴스 사용
+    """
+    print("=== 휴리스틱 (s,S) 탐색 ===")
+
+    def make_weekly_env(mode, seed):
+        return WeeklyInvEnv(
+            data_manager=dm,
+            item=args.item,
+            mode=mode,
+            history_length=args.history_length,
+            cost=cost,
+            action_unit=args.action_unit,
+            max_order=args.max_order,
+            seed=seed,
+            pipeline_horizon=args.pipeline_horizon,
+            reward_scale=args.reward_scale,
+        )
+
+    # 최종 Train/Valid 평가와 같은 시드 -> A2C 결과와 직접 비교 가능
+    heur_train_env = make_weekly_env('train', args.seed + 3000)
+    heur_valid_env = make_weekly_env('valid', args.seed + 4000)
+    n_actions = heur_train_env.action_space.n
+
+    # 1) 리드타임 sweep (0 ~ max_leadtime) x (s,S) 벡터화 사전 선별
+    max_leadtime = args.heuristic_max_leadtime if args.heuristic_max_leadtime is not None else args.pipeline_horizon
+    heuristic_results = search_heuristics(
+        buf["demand_arrays"]["train"],
+        cost,
+        leadtimes=range(max_leadtime + 1),
+        action_unit=args.action_unit,
+        max_order=args.max_order,
+        grid_size=args.heuristic_grid,
+    )
+    heuristic_results.to_csv(output_dir / "heuristic_search_results.csv", index=False)
+    print(f"후보 수: {len(heuristic_results)} (리드타임 0~{max_leadtime})")
+
+    # 2) 리드타임별 상위 후보를 실제 train 환경(샘플링 리드타임) 롤아웃으로 재정렬
+    best_sS, best_bs, ranked = rerank_candidates(
+        heur_train_env, heuristic_results,
+        top_k=args.heuristic_topk,
+        action_unit=args.action_unit,
+        n_actions=n_actions,
+    )
+    ranked.to_csv(output_dir / "heuristic_reranked.csv", index=False)
+    print(f"Best base-stock (train env): S={best_bs['S']:.0f}, sim L={best_bs['leadtime']:.0f} "
+          f"(train reward={best_bs['env_reward']:.4f})")
+    print(f"Best (s,S) (train env): s={best_sS['s']:.0f}, S={best_sS['S']:.0f}, sim L={best_sS['leadtime']:.0f} "
+          f"(train reward={best_sS['env_reward']:.4f})")
+
+    # 3) Valid baseline + 다중 시드 Test baseline (A2C multi_seed_evaluation과 같은 시드)
+    heuristic_policy = SSPolicy(best_sS['s'], best_sS['S'], action_unit=args.action_unit, n_actions=n_actions)
+    valid_reward, _ = rollout_heuristic(heur_valid_env, heuristic_policy, episodes=1)
+    print(f"Heuristic valid reward: {valid_reward:.4f}")
+
+    test_rewards = []
+    for seed in TEST_SEEDS:
+        reward, traj = rollout_heuristic(make_weekly_env('test', seed), heuristic_policy, episodes=1, seed=seed)
+        test_rewards.append(reward)
+        traj.to_csv(output_dir / f"heuristic_test_trajectory_seed{seed}.csv", index=False)
+
+    test_mean = np.mean(test_rewards)
+    test_std = np.std(test_rewards)
+    test_ci95 = 1.96 * test_std / np.sqrt(len(TEST_SEEDS))
+    pd.DataFrame({'seed': TEST_SEEDS, 'test_reward': test_rewards}).to_csv(
+        output_dir / "heuristic_test_multi_seed_results.csv", index=False
+    )
+    print(f"Heuristic test reward (multi-seed avg): {test_mean:.4f} ± {test_ci95:.4f}")
+
+    wandb.log({
+        "Heuristic/BaseStock_S": best_bs['S'],
+        "Heuristic/BaseStock_TrainReward": best_bs['env_reward'],
+        "Heuristic/sS_s": best_sS['s'],
+        "Heuristic/sS_S": best_sS['S'],
+        "Heuristic/sS_SimLeadtime": best_sS['leadtime'],
+        "Heuristic/TrainReward": best_sS['env_reward'],
+        "Heuristic/ValidReward": valid_reward,
+        "Heuristic/Test_MultiSeed_Mean": test_mean,
+        "Heuristic/Test_MultiSeed_Std": test_std,
+        "Heuristic/Test_MultiSeed_CI95": test_ci95,
+    }, step=0)
+
+    # 4) Behavior cloning warm start (선택)
+    if args.bc_episodes > 0:
+        print(f"\n=== Behavior Cloning 사전학습 ({args.bc_episodes} episodes) ===")
+        bc_env = GenerativeInvEnv(
+            data_manager=dm,
+            item=args.item,
+            mode='train',
+            episode_len=len(buf["demand_arrays"]["train"]),
+            cost=cost,
+            action_unit=args.action_unit,
+            max_order=args.max_order,
+            initial_on_hand=0.0,
+            allow_backlog=True,
+            history_length=args.history_length,
+            seed=args.seed + 5000,
+            pipeline_horizon=args.pipeline_horizon,
+            reward_scale=args.reward_scale,
+        )
+        bc_obs, bc_actions, bc_returns = collect_bc_data(
+            bc_env, heuristic_policy, episodes=args.bc_episodes, seed=args.seed + 5000, gamma=args.gamma
+        )
+        bc_losses = behavior_clone(
+            model, bc_obs, bc_actions, bc_returns,
+            epochs=args.bc_epochs,
+            lr=args.bc_lr,
+            seed=args.seed,
+        )
+        bc_reward, _, _ = evaluate_policy(heur_valid_env, model, episodes=1)
+        print(f"BC policy loss: {bc_losses[0][0]:.4f} -> {bc_losses[-1][0]:.4f}")
+        print(f"BC value loss: {bc_losses[0][1]:.4f} -> {bc_losses[-1][1]:.4f}")
+        print(f"BC valid reward: {bc_reward:.4f}")
+        wandb.log({
+            "Heuristic/BC_PolicyLoss": bc_losses[-1][0],
+            "Heuristic/BC_ValueLoss": bc_losses[-1][1],
+            "Heuristic/BC_ValidReward": bc_reward,
+        }, step=0)
+    print("완료!\n")
+
+    return {
+        's': best_sS['s'],
+        'S': best_sS['S'],
+        'valid_reward': valid_reward,
+        'test_mean': test_mean,
+        'test_ci95': test_ci95,
+    }
+
+
 # ========================================
 # 메인 실행
 # ========================================
@@ -379,6 +517,17 @@ def main():
     parser.add_argument("--pipeline_horizon", type=int, default=31, help="Pipeline horizon")
     parser.add_argument("--reward_scale", type=float, default=1.0, help="Reward scaling factor (1.0 = no scaling)")
 
+    # Heuristic baseline / Behavior cloning
+    parser.add_argument("--heuristic_baseline", action="store_true", help="Run (s,S) heuristic search and report as baseline")
+    # 벡터화 사전 선별은 리드타임 0 ~ max_leadtime 전체를 sweep (기본: pipeline_horizon, 파이프라인이 담을 수 있는 최대 리드타임)
+    # 리드타임별 상위 후보를 실제 train WeeklyInvEnv(샘플링 리드타임) 롤아웃으로 재정렬하여 최종 선택
+    parser.add_argument("--heuristic_max_leadtime", type=int, default=None, help="Max lead time (weeks) swept in (s,S) pre-screen (default: pipeline_horizon)")
+    parser.add_argument("--heuristic_grid", type=int, default=60, help="Grid points per (s,S) level")
+    parser.add_argument("--heuristic_topk", type=int, default=1, help="Top (s,S) candidates per lead time re-ranked on train WeeklyInvEnv")
+    parser.add_argument("--bc_episodes", type=int, default=0, help="Heuristic episodes for BC warm start (0 = off)")
+    parser.add_argument("--bc_epochs", type=int, default=20, help="BC epochs")
+    parser.add_argument("--bc_lr", type=float, default=1e-3, help="BC learning rate")
+
     args = parser.parse_args()
 
     # WandB 초기화 (키 파일에서 읽기)
@@ -549,6 +698,24 @@ def main():
         print(f"Eval frequency: {eval_freq_steps:,} steps ({args.eval_freq} episodes)")
         print("완료!\n")
 
+        # ========================================
+        # 3-1. 휴리스틱 baseline / BC warm start (선택)
+        # ========================================
+        heuristic = None
+        if args.heuristic_baseline or args.bc_episodes > 0:
+            try:
+                heuristic = run_heuristic_baseline(dm, args, cost, buf, model, output_dir)
+            except Exception as e:
+                wandb.log({"Heuristic/Failed": 1}, step=0)
+                # BC 요청 시: 정책이 일부만 학습됐거나 BC 없이 학습될 수 있으므로 BC-vs-no-BC 비교를 위해 중단
+                if args.bc_episodes > 0:
+                    print(f"\n!!! Heuristic/BC 실패 (--bc_episodes > 0 이므로 학습 중단): {e}")
+                    raise
+                # baseline만 요청 시: 모델은 그대로이므로 A2C 학습은 계속
+                print(f"\n!!! Heuristic baseline 실패 (A2C 학습은 계속): {e}")
+                import traceback
+                traceback.print_exc()
+
         # ========================================
         # 4. 콜백 설정
         # ========================================
@@ -662,6 +829,12 @@ def main():
             "Final/Test_Avg_OrderQty": test_metrics['avg_orderqty'],
             "Final/Test_ActionEntropy": test_metrics['action_entropy'],
         })
+        if heuristic is not None:
+            wandb.log({
+                "Final/Heuristic_ValidReward": heuristic['valid_reward'],
+                "Final/Heuristic_Test_MultiSeed_Mean": heuristic['test_mean'],
+                "Final/Heuristic_Test_MultiSeed_CI95": heuristic['test_ci95'],
+            })
 
         # ========================================
         # 7. 다중 시드 Test 평가 (10 seeds)
@@ -682,7 +855,7 @@ def main():
 
         # 다중 시드 결과 저장
         multi_seed_results = pd.DataFrame({
-            'seed': [42, 123, 456, 789, 1000, 1111, 2222, 3333, 4444, 5555],
+            'seed': TEST_SEEDS,
             'test_reward': test_rewards
         })
         multi_seed_results.to_csv(output_dir / "test_multi_seed_results.csv", index=False)
@@ -708,6 +881,9 @@ def main():
         print(f"Valid reward: {valid_reward:.4f}")
         print(f"Test reward (single seed): {test_reward:.4f}")
         print(f"Test reward (multi-seed avg): {test_mean:.4f} ± {test_ci95:.4f}")
+        if heuristic is not None:
+            print(f"Heuristic (s={heuristic['s']:.0f}, S={heuristic['S']:.0f}) valid: {heuristic['valid_reward']:.4f}")
+            print(f"Heuristic test (multi-seed avg): {heuristic['test_mean']:.4f} ± {heuristic['test_ci95']:.4f}")
         print(f"{'='*60}\n")
 
     except Exception as e:
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+재고 휴리스틱 (base-stock / (s,S)) 탐색 및 Behavior Cloning 유틸
+- 모든 (s, S) 후보 x 리드타임 sweep을 train 수요 위에서 한 번에 벡터화 시뮬레이션
+- 리드타임별 상위 후보를 실제 환경(WeeklyInvEnv) 롤아웃으로 재정렬하여 baseline으로 보고
+- 휴리스틱 행동으로 A2C MlpPolicy 사전학습 (behavior cloning)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ========================================
+# 벡터화 (s, S) 시뮬레이션
+# ========================================
+
+def simulate_sS_costs(demand, s_levels, S_levels, cost, leadtimes=0,
+                      action_unit=1, max_order=190, initial_on_hand=0.0):
+    """
+    (s, S, 리드타임) 후보 전체를 고정 수요 위에서 동시에 시뮬레이션
+
+    - 재고포지션(IP) < s 이면 S까지 주문 (action_unit 배수로 올림, max_order로 clip)
+    - s == S 인 후보는 base-stock 정책과 동일
+    - leadtimes: 후보별 고정 리드타임 (스칼라 또는 (n_candidates,) 배열)
+    - 비용: h*on_hand + b*backlog + c*q + K*1[q>0] (주문 후 도착 -> 수요 -> 비용 순서)
+
+    Returns:
+        dict of (n_candidates,) arrays: total / holding / backlog / order cost
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    s_levels = np.asarray(s_levels, dtype=np.float64)
+    S_levels = np.asarray(S_levels, dtype=np.float64)
+    n = len(s_levels)
+    L = np.broadcast_to(np.maximum(np.asarray(leadtimes, dtype=np.int64), 0), (n,))
+    rows = np.arange(n)
+
+    net_inv = np.full(n, float(initial_on_hand))       # on_hand - backlog
+    outstanding = np.zeros(n)                           # 미도착 주문 합
+    pipeline = np.zeros((n, int(L.max()) + 1))          # pipeline[:, k]: k주 후 도착
+    holding = np.zeros(n)
+    backlog = np.zeros(n)
+    ordering = np.zeros(n)
+
+    for d in demand:
+        inv_pos = net_inv + outstanding
+        need = np.where(inv_pos < s_levels, S_levels - inv_pos, 0.0)
+        q = np.minimum(np.ceil(need / action_unit) * action_unit, max_order)
+
+        pipeline[rows, L] += q
+        arrived = pipeline[:, 0].copy()
+        net_inv += arrived - d
+        outstanding += q - arrived
+        pipeline[:, :-1] = pipeline[:, 1:]
+        pipeline[:, -1] = 0.0
+
+        holding += cost.h * np.maximum(net_inv, 0.0)
+        backlog += cost.b * np.maximum(-net_inv, 0.0)
+        ordering += cost.c * q + cost.K * (q > 0)
+
+    return {
+        'total_cost': holding + backlog + ordering,
+        'holding_cost': holding,
+        'backlog_cost': backlog,
+        'order_cost': ordering,
+    }
+
+
+def search_heuristics(demand, cost, leadtimes=(0,), action_unit=1, max_order=190,
+                      grid_size=60, initial_on_hand=0.0):
+    """
+    base-stock / (s, S) 파라미터 그리드 탐색 (train 수요 기준)
+
+    실제 env 리드타임은 샘플링되므로 고정 리드타임 하나를 가정하지 않고 leadtimes 전체를 sweep:
+    리드타임 L마다 S 범위 0 ~ (L+1) * 최대 수요, s <= S 인 모든 쌍을 만들고
+    (s, S, L) 후보 전체를 한 번의 벡터화 시뮬레이션으로 평가 (최종 선택은 rerank_candidates)
+
+    Returns:
+        results: 전체 후보 결과 DataFrame (leadtime, total_cost 오름차순)
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    s_all, S_all, L_all = [], [], []
+    for L in leadtimes:
+        upper = max((int(L) + 1) * float(demand.max()), float(action_unit))
+        levels = np.unique(np.round(np.linspace(0.0, upper, grid_size) / action_unit) * action_unit)
+        s_idx, S_idx = np.triu_indices(len(levels))
+        s_all.append(levels[s_idx])
+        S_all.append(levels[S_idx])
+        L_all.append(np.full(len(s_idx), int(L)))
+    s_levels, S_levels, L_levels = np.concatenate(s_all), np.concatenate(S_all), np.concatenate(L_all)
+
+    costs = simulate_sS_costs(
+        demand, s_levels, S_levels, cost,
+        leadtimes=L_levels,
+        action_unit=action_unit,
+        max_order=max_order,
+        initial_on_hand=initial_on_hand,
+    )
+
+    results = pd.DataFrame({'leadtime': L_levels, 's': s_levels, 'S': S_levels, **costs})
+    results['policy'] = np.where(results['s'] == results['S'], 'base_stock', 'sS')
+    return results.sort_values(['leadtime', 'total_cost'], kind='stable').reset_index(drop=True)
+
+
+# ========================================
+# 휴리스틱 정책 (실제 환경 롤아웃용)
+# ========================================
+
+class SSPolicy:
+    """
+    (s, S) 휴리스틱 정책
+
+    관측값(스케일된 obs) 대신 env info의 order_qty / demand로 재고포지션을 추적
+    (backlog 허용 시 IP_{t+1} = IP_t + q_t - d_t 는 리드타임과 무관)
+    reset 시점의 pipeline(미도착 주문)은 비어 있다고 가정 (IP = on_hand - backlog)
+    """
+
+    def __init__(self, s, S, action_unit=1, n_actions=None):
+        self.s = float(s)
+        self.S = float(S)
+        self.action_unit = action_unit
+        self.n_actions = n_actions
+        self.inv_pos = 0.0
+
+    def reset(self, info=None, initial_on_hand=0.0):
+        # reset info에 재고 정보가 없으면 환경의 initial_on_hand 사용
+        info = info or {}
+        self.inv_pos = float(info.get('on_hand', initial_on_hand)) - float(info.get('backlog', 0.0))
+
+    def act(self):
+        if self.inv_pos >= self.s:
+            return 0
+        action = int(np.ceil((self.S - self.inv_pos) / self.action_unit))
+        if self.n_actions is not None:
+            action = min(action, self.n_actions - 1)
+        return action
+
+    def update(self, info):
+        # 키가 없으면 IP가 한쪽으로 누적 오차 -> 조용히 틀린 baseline 대신 KeyError
+        self.inv_pos += float(info['order_qty']) - float(info['demand'])
+
+
+def rollout_heuristic(env, policy, episodes=1, seed=123):
+    """휴리스틱 정책 롤아웃: (평균 reward, trajectory DataFrame) 반환"""
+    traj = []
+    total_reward = 0.0
+
+    for ep in range(episodes):
+        _, info = env.reset(seed=seed + ep)
+        policy.reset(info)
+        done = False
+
+        while not done:
+            action = policy.act()
+            _, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
+            total_reward += reward
+            policy.update(info)
+
+            row = {
+                'episode': ep,
+                'reward': reward,
+                'action_idx': action,
+            }
+            row.update(info)
+            traj.append(row)
+
+    return total_reward / episodes, pd.DataFrame(traj)
+
+
+def rerank_candidates(env, results, top_k=1, action_unit=1, n_actions=None, seed=123):
+    """
+    리드타임별 상위 top_k (s,S) 후보 + 최적 base-stock 후보를 실제 환경 롤아웃으로 재정렬
+
+    Returns:
+        best: dict (s, S, leadtime, sim 비용, env_reward) - 전체 최적
+        best_base_stock: dict - base-stock 후보 중 최적
+        ranked: 재정렬 후보 DataFrame (env_reward 내림차순)
+    """
+    by_lt = results.groupby('leadtime', sort=True)
+    ranked = pd.concat([
+        by_lt.head(top_k),
+        results[results['policy'] == 'base_stock'].groupby('leadtime', sort=True).head(1),
+    ]).drop_duplicates(subset=['s', 'S'])
+
+    env_rewards = []
+    for s, S in zip(ranked['s'], ranked['S']):
+        policy = SSPolicy(s, S, action_unit=action_unit, n_actions=n_actions)
+        reward, _ = rollout_heuristic(env, policy, episodes=1, seed=seed)
+        env_rewards.append(reward)
+
+    ranked = ranked.assign(env_reward=env_rewards)
+    ranked = ranked.sort_values('env_reward', ascending=False, kind='stable').reset_index(drop=True)
+    best_base_stock = ranked[ranked['policy'] == 'base_stock'].iloc[0].to_dict()
+    return ranked.iloc[0].to_dict(), best_base_stock, ranked
+
+
+# ========================================
+# Behavior Cloning (A2C MlpPolicy 사전학습)
+# ========================================
+
+def collect_bc_data(env, policy, episodes=1, seed=123, gamma=0.99):
+    """BC용 (obs, action, 할인 return) 수집 (info trajectory는 보관하지 않음)"""
+    obs_buf = []
+    act_buf = []
+    ret_buf = []
+
+    for ep in range(episodes):
+        obs, info = env.reset(seed=seed + ep)
+        policy.reset(info)
+        done = False
+        rewards = []
+
+        while not done:
+            action = policy.act()
+            obs_buf.append(np.asarray(obs, dtype=np.float32))
+            act_buf.append(action)
+
+            obs, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
+            rewards.append(reward)
+            policy.update(info)
+
+        # 에피소드별 reward-to-go
+        returns = np.zeros(len(rewards), dtype=np.float32)
+        running = 0.0
+        for t in reversed(range(len(rewards))):
+            running = rewards[t] + gamma * running
+            returns[t] = running
+        ret_buf.append(returns)
+
+    return np.stack(obs_buf), np.asarray(act_buf), np.concatenate(ret_buf)
+
+
+def behavior_clone(model, observations, actions, returns, epochs=20, batch_size=256, lr=1e-3, seed=0):
+    """
+    휴리스틱 데이터로 actor(cross-entropy)와 critic(return MSE)을 함께 학습
+
+    critic을 같이 맞추지 않으면 A2C 초기 update의 advantage가 무작위 critic 기준이 되어
+    warm start가 쉽게 무너짐. epoch별 평균 (policy loss, value loss) 반환
+    """
+    import torch as th
+    import torch.nn.functional as F
+
+    policy = model.policy
+    policy.set_training_mode(True)
+    optimizer = th.optim.Adam(policy.parameters(), lr=lr)
+
+    obs_t = th.as_tensor(observations, dtype=th.float32, device=policy.device)
+    act_t = th.as_tensor(actions, dtype=th.long, device=policy.device)
+    ret_t = th.as_tensor(returns, dtype=th.float32, device=policy.device)
+    rng = np.random.default_rng(seed)
+    losses = []
+
+    for _ in range(epochs):
+        perm = rng.permutation(len(act_t))
+        epoch_pi_loss = 0.0
+        epoch_vf_loss = 0.0
+        for start in range(0, len(perm), batch_size):
+            idx = th.as_tensor(perm[start:start + batch_size], device=policy.device)
+            values, log_prob, _ = policy.evaluate_actions(obs_t[idx], act_t[idx])
+            pi_loss = -log_prob.mean()
+            vf_loss = F.mse_loss(values.flatten(), ret_t[idx])
+            loss = pi_loss + model.vf_coef * vf_loss
+
+            optimizer.zero_grad()
+            loss.backward()
+            th.nn.utils.clip_grad_norm_(policy.parameters(), model.max_grad_norm)
+            optimizer.step()
+            epoch_pi_loss += pi_loss.item() * len(idx)
+            epoch_vf_loss += vf_loss.item() * len(idx)
+        losses.append((epoch_pi_loss / len(perm), epoch_vf_loss / len(perm)))
+
+    policy.set_training_mode(False)
+    return losses
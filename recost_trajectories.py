@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+저장된 trajectory 기반 What-if 비용 재계산
+- 고정된 행동 시퀀스의 on_hand / backlog / order_qty 로 비용을 재계산 (정책 롤아웃 없음)
+- (h, b, c, K) 그리드 전체를 한 번의 브로드캐스팅 연산으로 평가
+- 재구성한 기준 비용을 저장된 항목별 비용 컬럼과 대조하여 파라미터/공식 불일치 검출
+- 원래 비용 대비 총비용/항목별 비용 변화 보고
+"""
+
+import sys
+import time
+import argparse
+import itertools
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+
+# 비용 항목 순서: h*on_hand, b*backlog, c*order_qty, K*1[order_qty>0]
+# (출력의 order_cost = variable_order_cost + fixed_cost 로 env trajectory의 order_cost와 같은 의미)
+COMPONENTS = ['holding_cost', 'backlog_cost', 'variable_order_cost', 'fixed_cost']
+
+# env가 step마다 기록하는 항목별 비용 컬럼 (order_cost는 c*q + K*1[q>0] 로 대조)
+STORED_COMPONENTS = ['holding_cost', 'backlog_cost', 'order_cost']
+
+
+# ========================================
+# Trajectory 로드
+# ========================================
+
+def load_trajectories(run_dir, pattern="test_trajectory_seed*.csv"):
+    """
+    trajectory CSV 로드
+
+    Returns:
+        names: 파일명 리스트
+        features: 합산 특성 (F, 4) [on_hand, backlog, order_qty, 주문 횟수]
+        original_cost: 파일별 기존 총비용 (F,), cost 컬럼 없으면 NaN
+        stored_components: 저장된 항목별 비용 합 (F, 3), 컬럼 없으면 NaN
+    """
+    paths = sorted(Path(run_dir).glob(pattern))
+    if not paths:
+        raise FileNotFoundError(f"trajectory 파일 없음: {Path(run_dir) / pattern}")
+
+    names = []
+    features = []
+    original_cost = []
+    stored_components = []
+
+    for path in paths:
+        traj = pd.read_csv(path)
+        missing = [col for col in ('on_hand', 'backlog', 'order_qty') if col not in traj.columns]
+        if missing:
+            raise ValueError(f"{path.name}: 필수 컬럼 없음 {missing}")
+
+        order_qty = traj['order_qty'].to_numpy(dtype=np.float64)
+        features.append([
+            traj['on_hand'].to_numpy(dtype=np.float64).sum(),
+            traj['backlog'].to_numpy(dtype=np.float64).sum(),
+            order_qty.sum(),
+            float((order_qty > 0).sum()),
+        ])
+        original_cost.append(traj['cost'].sum() if 'cost' in traj.columns else np.nan)
+        stored_components.append([
+            traj[col].sum() if col in traj.columns else np.nan for col in STORED_COMPONENTS
+        ])
+        names.append(path.name)
+
+    return (names, np.asarray(features), np.asarray(original_cost, dtype=np.float64),
+            np.asarray(stored_components, dtype=np.float64))
+
+
+def check_base_params(names, features, stored_components, base_params, rtol=1e-3, atol=1e-6):
+    """
+    기준 파라미터로 재구성한 비용과 저장된 항목별 비용 비교
+
+    --cost_* 가 실제 run 파라미터와 다르거나 env 비용 공식이 다르면 모든 what-if 결과가
+    (실제 기준 - 입력 기준) * 특성 만큼 틀어지므로 사전에 검출
+
+    Returns:
+        mismatches: 불일치 메시지 리스트
+        missing: 비교 불가(컬럼 없음) 항목 이름 리스트
+    """
+    base = features * np.asarray(base_params, dtype=np.float64)
+    rebuilt = np.stack([base[:, 0], base[:, 1], base[:, 2] + base[:, 3]], axis=1)  # (F, 3)
+
+    mismatches = []
+    missing = [col for j, col in enumerate(STORED_COMPONENTS) if np.isnan(stored_components[:, j]).any()]
+    for f, name in enumerate(names):
+        for j, col in enumerate(STORED_COMPONENTS):
+            stored = stored_components[f, j]
+            if np.isnan(stored):
+                continue
+            if not np.isclose(rebuilt[f, j], stored, rtol=rtol, atol=atol):
+                mismatches.append(f"{name}: {col} 재구성={rebuilt[f, j]:.4f}, 저장값={stored:.4f}")
+
+    return mismatches, missing
+
+
+# ========================================
+# 벡터화 재계산
+# ========================================
+
+def cost_grid(h_values, b_values, c_values, K_values):
+    """(h, b, c, K) 데카르트 곱 그리드: (G, 4) 배열"""
+    return np.asarray(list(itertools.product(h_values, b_values, c_values, K_values)), dtype=np.float64)
+
+
+def recost(features, grid, base_params, original_cost=None):
+    """
+    trajectory 특성 (F, 4) x 비용 그리드 (G, 4) 재계산
+
+    - 항목별 비용 = features[f, j] * grid[g, j]
+    - 기존 cost 컬럼이 있으면 (h,b,c,K)로 설명되지 않는 잔여 비용(N 항 등)은 고정값으로 유지
+      (cost 컬럼이 없는 파일은 잔여 비용 0으로 처리: 호출 측에서 경고)
+
+    Returns:
+        DataFrame (F*G 행): 파라미터, 항목별 비용, 총비용, 기준 대비 변화량
+    """
+    F, G = len(features), len(grid)
+    components = features[:, None, :] * grid[None, :, :]          # (F, G, 4)
+    base_components = features * np.asarray(base_params, dtype=np.float64)  # (F, 4)
+
+    residual = np.zeros(F)
+    if original_cost is not None:
+        residual = np.nan_to_num(original_cost - base_components.sum(axis=1))
+
+    total = components.sum(axis=2) + residual[:, None]               # (F, G)
+    base_total = base_components.sum(axis=1) + residual               # (F,)
+
+    result = pd.DataFrame({
+        'trajectory': np.repeat(np.arange(F), G),
+        'h': np.tile(grid[:, 0], F),
+        'b': np.tile(grid[:, 1], F),
+        'c': np.tile(grid[:, 2], F),
+        'K': np.tile(grid[:, 3], F),
+    })
+    for j, name in enumerate(COMPONENTS):
+        result[name] = components[:, :, j].ravel()
+        result[f'delta_{name}'] = (components[:, :, j] - base_components[:, None, j]).ravel()
+    result['order_cost'] = result['variable_order_cost'] + result['fixed_cost']
+    result['delta_order_cost'] = result['delta_variable_order_cost'] + result['delta_fixed_cost']
+    result['other_cost'] = np.repeat(residual, G)
+    result['total_cost'] = total.ravel()
+    result['delta_total_cost'] = (total - base_total[:, None]).ravel()
+    result['pct_total_cost'] = 100.0 * result['delta_total_cost'] / np.repeat(np.where(base_total != 0, base_total, np.nan), G)
+
+    return result
+
+
+def summarize(result):
+    """trajectory(시드) 평균으로 그리드별 요약 (pct_total_cost는 평균 delta / 평균 기준 총비용으로 재계산)"""
+    value_cols = [col for col in result.columns if col not in ('trajectory', 'h', 'b', 'c', 'K', 'pct_total_cost')]
+    summary = result.groupby(['h', 'b', 'c', 'K'], sort=False)[value_cols].mean().reset_index()
+    base_total = summary['total_cost'] - summary['delta_total_cost']
+    summary['pct_total_cost'] = 100.0 * summary['delta_total_cost'] / base_total.where(base_total != 0)
+    return summary
+
+
+# ========================================
+# 메인 실행
+# ========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if cost re-evaluation from stored trajectories")
+    parser.add_argument("--run_dir", type=str, required=True, help="Run output directory (run_<id>)")
+    parser.add_argument("--pattern", type=str, default="test_trajectory_seed*.csv", help="Trajectory file glob")
+    parser.add_argument("--output", type=str, default=None, help="Output CSV (default: <run_dir>/whatif_costs.csv)")
+    parser.add_argument("--rtol", type=float, default=1e-3, help="Relative tolerance for baseline cost check")
+    parser.add_argument("--allow_mismatch", action="store_true", help="Warn instead of failing on baseline cost mismatch")
+
+    # 기준 cost parameters (학습 시 사용한 값)
+    parser.add_argument("--cost_h", type=float, default=0.10, help="Holding cost (baseline)")
+    parser.add_argument("--cost_b", type=float, default=0.10, help="Backlog cost (baseline)")
+    parser.add_argument("--cost_c", type=float, default=0.10, help="Order cost per unit (baseline)")
+    parser.add_argument("--cost_K", type=float, default=0.00, help="Fixed order cost (baseline)")
+
+    # What-if 그리드 (미지정 시 기준값 고정)
+    parser.add_argument("--h_grid", type=float, nargs='+', default=None, help="Holding cost values")
+    parser.add_argument("--b_grid", type=float, nargs='+', default=None, help="Backlog cost values")
+    parser.add_argument("--c_grid", type=float, nargs='+', default=None, help="Order cost values")
+    parser.add_argument("--K_grid", type=float, nargs='+', default=None, help="Fixed order cost values")
+
+    args = parser.parse_args()
+
+    base_params = [args.cost_h, args.cost_b, args.cost_c, args.cost_K]
+    grid = cost_grid(
+        args.h_grid or [args.cost_h],
+        args.b_grid or [args.cost_b],
+        args.c_grid or [args.cost_c],
+        args.K_grid or [args.cost_K],
+    )
+
+    try:
+        names, features, original_cost, stored_components = load_trajectories(args.run_dir, args.pattern)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"!!! Error: {e}")
+        sys.exit(1)
+
+    # 기준 파라미터 검증 (저장된 항목별 비용 컬럼 대조)
+    mismatches, missing = check_base_params(names, features, stored_components, base_params, rtol=args.rtol)
+    if missing:
+        print(f"경고: 저장된 비용 컬럼 없음 {missing} -> 해당 항목은 기준 파라미터 검증 생략")
+    if mismatches:
+        print(f"{'경고' if args.allow_mismatch else '!!! Error'}: 기준 파라미터로 재구성한 비용이 저장값과 불일치 "
+              f"(--cost_* 가 run 파라미터와 다르거나 env 비용 공식이 다름)")
+        for msg in mismatches[:10]:
+            print(f"  {msg}")
+        if len(mismatches) > 10:
+            print(f"  ... 외 {len(mismatches) - 10}건")
+        if not args.allow_mismatch:
+            sys.exit(1)
+
+    no_cost = [name for name, c in zip(names, original_cost) if np.isnan(c)]
+    if no_cost:
+        print(f"경고: cost 컬럼 없음 ({len(no_cost)}개 파일) -> 잔여 비용(N 항 등)을 0으로 가정, 총비용 과소평가 가능")
+
+    start = time.perf_counter()
+    result = recost(features, grid, base_params, original_cost)
+    summary = summarize(result)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+    result.insert(1, 'file', np.repeat(names, len(grid)))
+
+    output_path = Path(args.output) if args.output else Path(args.run_dir) / "whatif_costs.csv"
+    result.to_csv(output_path, index=False)
+    summary.to_csv(output_path.with_name(output_path.stem + "_summary.csv"), index=False)
+
+    print(f"\n{'='*60}")
+    print("=== What-if 비용 재계산 ===")
+    print(f"{'='*60}")
+    print(f"Trajectories: {len(names)} ({args.pattern})")
+    print(f"Cost grid: {len(grid)} combinations")
+    print(f"Baseline: h={args.cost_h}, b={args.cost_b}, c={args.cost_c}, K={args.cost_K}")
+    print(f"재계산 시간: {elapsed_ms:.2f} ms")
+    print(f"---")
+    with pd.option_context('display.max_rows', 50, 'display.width', 160):
+        print(summary[['h', 'b', 'c', 'K', 'total_cost', 'delta_total_cost', 'pct_total_cost',
+                       'delta_holding_cost', 'delta_backlog_cost', 'delta_variable_order_cost', 'delta_fixed_cost']]
+              .sort_values('total_cost').to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print(f"---")
+    print(f"결과 저장: {output_path}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()